@@ -1,22 +1,247 @@
 #!/usr/bin/env python3
 
+import functools
 import re
+import sys
+import types
 import attr
 
 
-ALL_COMMANDS = []
+# Every registered command, in registration order. It is a tuple so callers
+# can not change it behind the back of the dispatch tables
+ALL_COMMANDS = ()
+
+# Dispatch tables filled by register(): commands with a plain string pattern
+# (or a tuple of them) are looked up by exact match, the rest are bucketed by
+# the first one or two characters their pattern accepts and tried in
+# registration order.
+# Every bucket also holds the commands filed under a shorter key it starts
+# with, the '' bucket holds the commands without a fixed prefix.
+_LITERAL_COMMANDS = {}
+_REGEX_COMMANDS = {'': ()}
+
+# Frames sharing a prefix that only a known group of commands can match are
+# classified with a single fused pattern, see register_family()
+_REGEX_FAMILIES = {}
+
+# Read only views of the tables above. Buckets are tuples and family members
+# mapping proxies, so register() and register_family() are the only way to
+# change them, they also invalidate the match_command() cache
+LITERAL_COMMANDS = types.MappingProxyType(_LITERAL_COMMANDS)
+REGEX_COMMANDS = types.MappingProxyType(_REGEX_COMMANDS)
+REGEX_FAMILIES = types.MappingProxyType(_REGEX_FAMILIES)
+
+REGEX_SPECIAL_CHARS = '.^$*+?{}[]|()'
+
+
+def literal_prefix(pattern):
+    """ Returns the fixed text every match of a compiled pattern starts with,
+    possibly empty """
+    source = pattern.pattern
+    if '|' in source or pattern.flags & (re.IGNORECASE | re.VERBOSE):
+        return ''
+
+    if source.startswith('^'):
+        source = source[1:]
+
+    prefix = []
+    idx = 0
+    while idx < len(source):
+        char = source[idx]
+        if char == '\\':
+            escaped = source[idx + 1:idx + 2]
+            if not escaped or escaped.isalnum():
+                break
+            char = escaped
+            idx += 1
+        elif char in REGEX_SPECIAL_CHARS:
+            break
+
+        prefix.append(char)
+        idx += 1
+
+    # A quantifier makes the last character optional
+    if prefix and source[idx:idx + 1] in ('*', '?', '{'):
+        prefix.pop()
+
+    return ''.join(prefix)
+
+
+def prefixes_overlap(prefix, other):
+    """ Returns True if some data could start with both literal prefixes.
+    An empty prefix tells nothing about the data, so it never overlaps """
+    if not prefix or not other:
+        return False
+    return prefix.startswith(other) or other.startswith(prefix)
 
 
 def register(command):
-    ALL_COMMANDS.append(command)
+    global ALL_COMMANDS
+
+    pattern = getattr(command, 'pattern', None)
+    if isinstance(pattern, re.Pattern):
+        for (family_prefix, (_, family)) in _REGEX_FAMILIES.items():
+            members = [member.pattern for member in family.values()]
+            if prefixes_overlap(literal_prefix(pattern), family_prefix) and pattern not in members:
+                raise ValueError('Command {} would be shadowed by the {} family'.format(command.__name__, family_prefix))
+
+    ALL_COMMANDS += (command,)
+    if isinstance(pattern, str):
+        # First registered command wins, as it did on the linear scan
+        _LITERAL_COMMANDS.setdefault(pattern, command)
+    elif isinstance(pattern, tuple):
+        for literal in pattern:
+            _LITERAL_COMMANDS.setdefault(literal, command)
+    elif pattern is not None:
+        prefix = literal_prefix(pattern)
+        key = prefix[:2]
+        # The bucket key already checks up to two characters, only a longer
+        # prefix is worth testing before the regex. Set on every command so
+        # subclasses never inherit the prefix of their parent
+        command._prefix = prefix if len(prefix) > len(key) else None
+        # Aliases reuse the pattern of the command they extend, which always
+        # matches first, trying them as well would only slow down misses
+        is_alias = any(other.pattern is pattern for other in _REGEX_COMMANDS.get(key, ()))
+        if not is_alias:
+            if key not in _REGEX_COMMANDS:
+                _REGEX_COMMANDS[key] = _REGEX_COMMANDS.get(key[:1]) or _REGEX_COMMANDS['']
+            for bucket_key, bucket in _REGEX_COMMANDS.items():
+                if bucket_key.startswith(key):
+                    _REGEX_COMMANDS[bucket_key] = bucket + (command,)
+
+    match_command.cache_clear()
     return command
 
 
+def register_family(prefix, *commands):
+    """ Fuses the patterns of commands into one, every frame starting with
+    the two character prefix is then classified with a single match and
+    parsed with the pattern of the command that matched.
+    All commands must use the same regex flags, and no other regex command
+    with a fixed prefix may accept data starting with prefix. Commands
+    without one are never tried on such data.
+    Returns the fused pattern """
+    flags = {command.pattern.flags for command in commands}
+    if len(flags) != 1:
+        raise ValueError('Commands of the {} family use different regex flags'.format(prefix))
+
+    alternatives = []
+    family = {}
+    for command in commands:
+        source = command.pattern.pattern
+        if source.startswith('^'):
+            source = source[1:]
+        if source.endswith('$') and not source.endswith('\\$'):
+            source = source[:-1]
+
+        alternatives.append('(?P<{}>{})'.format(command.__name__, source))
+        family[command.__name__] = command
+
+    patterns = [command.pattern for command in commands]
+    for bucket in _REGEX_COMMANDS.values():
+        for command in bucket:
+            if command.pattern not in patterns and prefixes_overlap(literal_prefix(command.pattern), prefix):
+                raise ValueError('Command {} would be shadowed by the {} family'.format(command.__name__, prefix))
+
+    for bucket_key, bucket in _REGEX_COMMANDS.items():
+        _REGEX_COMMANDS[bucket_key] = tuple(command for command in bucket if command.pattern not in patterns)
+    pattern = re.compile('|'.join(alternatives), flags.pop())
+    _REGEX_FAMILIES[prefix] = (pattern, types.MappingProxyType(family))
+    match_command.cache_clear()
+
+    return pattern
+
+
+@functools.lru_cache(maxsize=None)
+def serialized_fields(command):
+    """ Returns the names of the fields of command that serialize() includes,
+    the ones shown in its repr """
+    return tuple(field.name for field in attr.fields(command) if field.repr)
+
+
+def ascii_text(data):
+    """ Returns bytes data decoded as ASCII text, or None if it is not ASCII.
+    Patterns and field converters work on str, so bytes are decoded first """
+    if not data.isascii():
+        return None
+    return data.decode('ascii')
+
+
 def is_command(data, command):
     return command.can_be(data) not in (None, False)
 
 
-@attr.s
+# Clients poll the same few commands over and over, so the command resolved
+# for each block of data is cached along with its match. Match objects are
+# immutable, instances are never cached here.
+@functools.lru_cache(maxsize=256)
+def match_command(data):
+    """ Returns a (command class, matches) tuple for the command that can
+    parse data, or None """
+    # The tables are keyed on text
+    if isinstance(data, bytes):
+        data = ascii_text(data)
+        if data is None:
+            return None
+
+    command = _LITERAL_COMMANDS.get(data)
+    if command is not None:
+        return command, True
+
+    family = _REGEX_FAMILIES.get(data[:2])
+    if family is not None:
+        pattern, commands = family
+        matches = pattern.fullmatch(data)
+        if matches is None:
+            return None
+        command = commands[matches.lastgroup]
+        matches = command.can_be(data)
+        if not matches:
+            return None
+        return command, matches
+
+    bucket = _REGEX_COMMANDS.get(data[:2]) or _REGEX_COMMANDS.get(data[:1]) or _REGEX_COMMANDS['']
+    for command in bucket:
+        # A plain prefix test rules out most candidates without entering the regex engine
+        if command._prefix is not None and not data.startswith(command._prefix):
+            continue
+        matches = command.can_be(data)
+        if matches:
+            return command, matches
+
+    return None
+
+
+def parse_command(data):
+    """ Returns a new instance of the command that can parse data,
+    or an UnknownCommand if there is none """
+    found = match_command(data)
+    if found is None:
+        return UnknownCommand.from_data(data)
+
+    command, matches = found
+    return command.from_match(matches, data)
+
+
+# Precomputed values for the one or two digit (optionally signed) arguments
+# most commands take, int() is noticeably slower for these
+SMALL_INTS = {}
+for _value in range(100):
+    SMALL_INTS[str(_value)] = SMALL_INTS['{:02d}'.format(_value)] = _value
+    SMALL_INTS['+{:02d}'.format(_value)] = SMALL_INTS[' {:02d}'.format(_value)] = _value
+    SMALL_INTS['-{:02d}'.format(_value)] = -_value
+del _value
+
+
+def small_int(data='0'):
+    """ Same as int() but takes the values for short arguments from SMALL_INTS """
+    try:
+        return SMALL_INTS[data]
+    except KeyError:
+        return int(data)
+
+
+@attr.s(slots=True)
 class BaseCommand:
     value = attr.ib(default=None)
 
@@ -24,7 +249,7 @@ class BaseCommand:
     def from_data(cls, data):
         """ Tries to parse the given data block as this command.
         If successful returns a new instance of this command properly
-        initialized"""
+        initialized, otherwise returns None"""
         raise NotImplementedError
 
     @classmethod
@@ -34,16 +259,17 @@ class BaseCommand:
 
     def serialize(self):
         """ Returns a dict with current data suitable to build a response """
-        try:
-            return self.store_value
-        except:
-            pass
+        store_value = getattr(self, 'store_value', None)
+        if store_value is not None:
+            # A copy, the class level mapping is read only and is not JSON serializable
+            return dict(store_value)
 
-        to_include = [field for field in attr.fields(self.__class__) if field.repr]
-        return attr.asdict(self, filter=attr.filters.include(*to_include))
+        return {name: getattr(self, name) for name in serialized_fields(self.__class__)}
 
 
 class UnknownCommand(BaseCommand):
+    __slots__ = ()
+
     @classmethod
     def from_data(cls, data=None):
         instance = cls(value=data)
@@ -55,80 +281,172 @@ class UnknownCommand(BaseCommand):
         return True
 
 
-@attr.s
+@attr.s(slots=True)
 class SimpleCommand(BaseCommand):
     value = attr.ib(default=None, repr=False)
     pattern = None
+    _fullmatch = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Literal patterns are interned and encoded once so can_be does not
+        # have to build a new bytes object on every call
+        if isinstance(cls.pattern, str):
+            cls.pattern = sys.intern(cls.pattern)
+            cls._pattern_bytes = cls.pattern.encode('ascii')
+            cls._share_instance()
+        elif isinstance(cls.pattern, tuple):
+            cls.pattern = tuple(sys.intern(literal) for literal in cls.pattern)
+            cls._pattern_bytes = tuple(literal.encode('ascii') for literal in cls.pattern)
+            cls._share_instance()
+        elif cls.pattern is not None:
+            # Bound once, can_be skips the attribute lookups on every call
+            cls._fullmatch = cls.pattern.fullmatch
+
+        # store_value is shared by every instance, it must not be changed by callers
+        store_value = cls.__dict__.get('store_value')
+        if isinstance(store_value, dict):
+            cls.store_value = types.MappingProxyType(store_value)
+
+    @classmethod
+    def _share_instance(cls):
+        """ Literal commands carry no data, from_match() hands out a single
+        instance per class that is read only so no caller can change it for
+        the others """
+        cls._instance = None
+        cls.__setattr__ = SimpleCommand._shared_setattr
+        cls.__delattr__ = SimpleCommand._shared_delattr
+
+    def _shared_setattr(self, name, value):
+        if self is type(self)._instance:
+            raise AttributeError('{} instances are shared and read only'.format(type(self).__name__))
+        object.__setattr__(self, name, value)
+
+    def _shared_delattr(self, name):
+        if self is type(self)._instance:
+            raise AttributeError('{} instances are shared and read only'.format(type(self).__name__))
+        object.__delattr__(self, name)
 
     @classmethod
     def from_data(cls, data):
         matches = cls.can_be(data)
         if not matches:
-            raise ValueError('Provided block of data "{}" is not valid for {}'.format(data, cls.__qualname__))
-        else:
-            instance = cls()
-            return instance.parse(matches, data)
+            return None
+
+        return cls.from_match(matches, data)
+
+    @classmethod
+    def from_match(cls, matches, data):
+        """ Builds a new instance from the result of a successful can_be """
+        # Literal commands carry no data, all of them share a single instance
+        if isinstance(cls.pattern, (str, tuple)):
+            instance = cls._instance
+            if instance is None:
+                instance = cls._instance = cls()
+            return instance
+
+        instance = cls()
+        return instance.parse(matches, data)
 
     def parse(self, matches, data=None):
         return self
 
     @classmethod
     def can_be(cls, data):
-        if cls.pattern is None:
+        pattern = cls.pattern
+        if isinstance(pattern, str):
+            return data is pattern or data == pattern or data == cls._pattern_bytes
+
+        if isinstance(pattern, tuple):
+            return data in pattern or data in cls._pattern_bytes
+
+        if pattern is None:
             raise NotImplementedError('Command pattern is not defined')
 
-        try:
-            return cls.pattern.fullmatch(data)
-        except AttributeError:
-            return (data == cls.pattern) or (data == bytes(cls.pattern, 'utf-8'))
+        if isinstance(data, bytes):
+            data = ascii_text(data)
+            if data is None:
+                return None
+        return cls._fullmatch(data)
 
 
-@attr.s
+@attr.s(slots=True)
 class SimpleNumericCommand(SimpleCommand):
     value = attr.ib(default=0, repr=True)
     default_type = int
     type_map = {}
 
-    def parse(self, matches, data):
-        named_groups = matches.groupdict()
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Resolve once which converter applies to each named group
+        groups = cls.pattern.groupindex if cls.pattern is not None else {}
+        cls._converters = tuple(
+            (name, index, cls.type_map.get(name, cls.default_type)) for (name, index) in groups.items()
+        )
 
-        if not named_groups:
-            self.value = self.default_type(matches.group(1))
-            return self
+    @classmethod
+    def from_match(cls, matches, data):
+        if cls.parse is not SimpleNumericCommand.parse:
+            instance = cls()
+            return instance.parse(matches, data)
+
+        # Converted values go straight to __init__
+        if not cls._converters:
+            return cls(value=cls.default_type(matches.group(1)))
+
+        return cls(**cls.convert_groups(matches))
 
-        for (name, value) in named_groups.items():
-            converter = self.type_map.get(name, self.default_type)
+    @classmethod
+    def convert_groups(cls, matches):
+        """ Returns a dict with the converted value of every named group """
+        values = {}
+        for (name, index, converter) in cls._converters:
+            value = matches.group(index)
             # If a group is optional its value will be None
             # built-in types (like int, float) do not handle None as a valid argument
             # however, this way we can get a sane default
             if value is not None:
-                setattr(self, name, converter(value))
+                values[name] = converter(value)
             else:
-                setattr(self, name, converter())
+                values[name] = converter()
+
+        return values
+
+    def parse(self, matches, data):
+        if not self._converters:
+            self.value = self.default_type(matches.group(1))
+            return self
+
+        for (name, value) in self.convert_groups(matches).items():
+            setattr(self, name, value)
 
         return self
 
 
-@attr.s
+@attr.s(slots=True)
 class SignedDMSCommand(SimpleNumericCommand):
     value = attr.ib(default=None, repr=False)
+    default_type = staticmethod(small_int)
     degrees = attr.ib(default=0)
     minutes = attr.ib(default=0)
     seconds = attr.ib(default=0)
 
     def parse(self, matches, data):
         super().parse(matches, data)
+        # Only degrees carries the sign, seconds defaults to 0 when a
+        # subclass pattern leaves it out
         if self.degrees < 0:
-            self.minutes = -1 * self.minutes
-            try:
-                self.seconds = -1 * self.seconds
-            except:
-                # We may not have seconds in some subclasses
-                pass
+            self.minutes = -self.minutes
+            self.seconds = -self.seconds
 
         return self
 
 
+# Signed DD:MM[:SS] angles and HH:MM:SS times, shared by the commands that set them
+DMS_PATTERN = r'(?P<degrees>[-+ ]?\d{2}):(?P<minutes>\d{2}):?(?P<seconds>\d{2})?'
+HMS_PATTERN = r'(?P<hours>\d{2}):(?P<minutes>\d{2}):(?P<seconds>\d{2})'
+
+
 # These two are here for completeness only, as they do not use the start and
 # end delimiters shared by the rest of the command set.
 @register
@@ -176,23 +494,29 @@ class AltAzAlignment(SimpleCommand):
 # Anti Backlash
 
 @register
+@attr.s(slots=True)
 class SetAltitudeAntiBacklash(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'mount.backlash.altitude'
-    pattern = re.compile(r'^\$BA ?(\d{1,2})$')
+    pattern = re.compile(r'\$BA ?(\d{1,2})')
 
 
 @register
+@attr.s(slots=True)
 class SetDeclinationAntiBacklash(SetAltitudeAntiBacklash):
     pass
 
 
 @register
+@attr.s(slots=True)
 class SetAzimuthAntiBacklash(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'mount.backlash.azimuth'
-    pattern = re.compile(r'^\$BZ ?(\d{1,2})$')
+    pattern = re.compile(r'\$BZ ?(\d{1,2})')
 
 
 @register
+@attr.s(slots=True)
 class SetRightAscentionAntiBacklash(SetAzimuthAntiBacklash):
     pass
 
@@ -210,15 +534,22 @@ class DecreaseReticleBrightness(SimpleCommand):
 
 
 @register
+@attr.s(slots=True)
 class SetReticleFlashRate(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'reticle.flash.rate'
-    pattern = re.compile(r'^\$B ?(\d)$')
+    pattern = re.compile(r'\$B ?(\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetReticleFlashDutyCycle(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'reticle.flash.duty_cycle'
-    pattern = re.compile(r'^\$BD ?(\d{1,2})$')
+    pattern = re.compile(r'\$BD ?(\d{1,2})')
+
+
+BACKLASH_RETICLE_PATTERN = register_family('$B', SetAltitudeAntiBacklash, SetAzimuthAntiBacklash, SetReticleFlashRate, SetReticleFlashDutyCycle)
 
 
 # Sync Control
@@ -256,14 +587,16 @@ class MoveFocuserOutward(SimpleCommand):
 
 
 @register
+@attr.s(slots=True)
 class PulseFocuser(SimpleNumericCommand):
-    pattern = re.compile(r'^FP ?([-+ ]?\d{1,5})$')
+    pattern = re.compile(r'FP ?([-+ ]?\d{1,5})')
 
 
 @register
+@attr.s(slots=True)
 class TiltCorrectorPlate(SimpleCommand):
     default_type = str
-    pattern = re.compile(r'^FC ?([nsew])$')
+    pattern = re.compile(r'FC ?([nsew])')
 
 
 @register
@@ -272,22 +605,26 @@ class HaltFocuserMotion(SimpleCommand):
 
 
 @register
+@attr.s(slots=True)
 class SetFocuserPreset(SimpleNumericCommand):
-    pattern = re.compile(r'^FLD ?([123456789])$')
+    default_type = staticmethod(small_int)
+    pattern = re.compile(r'FLD ?([123456789])')
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetFocuserPresetName(SimpleNumericCommand):
     default_type = str
     store_path = 'focuser.presets.name_{idx}'
     idx = attr.ib(default=1)
-    pattern = re.compile(r'^FLN ?(?P<idx>[123456789])(?P<value>[\w\s]+)$')
+    pattern = re.compile(r'FLN ?(?P<idx>[123456789])(?P<value>[\w\s]+)', re.ASCII)
 
 
 @register
+@attr.s(slots=True)
 class SyncFocuserToPreset(SimpleNumericCommand):
-    pattern = re.compile(r'^FLS ?([123456789])$')
+    default_type = staticmethod(small_int)
+    pattern = re.compile(r'FLS ?([123456789])')
 
 
 @register
@@ -305,11 +642,12 @@ class SetFocuserSpeedSlowest(SimpleCommand):
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetFocuserSpeed(SimpleNumericCommand):
     value = attr.ib(default=1)
+    default_type = staticmethod(small_int)
     store_path = 'focuser.speed'
-    pattern = re.compile(r'^F ?([1234])$')
+    pattern = re.compile(r'F ?([1234])')
 
 
 @register
@@ -590,9 +928,10 @@ class SeekHomePosition(SimpleCommand):
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class BypassDSTEntry(SimpleNumericCommand):
     value = attr.ib(default=None, repr=False)
+    default_type = staticmethod(small_int)
     # YYMMDDHHMMSS
     year = attr.ib(default=None)
     month = attr.ib(default=None)
@@ -600,7 +939,13 @@ class BypassDSTEntry(SimpleNumericCommand):
     hours = attr.ib(default=None)
     minutes = attr.ib(default=None)
     seconds = attr.ib(default=None)
-    pattern = re.compile(r'^hI ?(?P<year>\d{2})(?P<month>\d{2})(?P<day>\d{2})(?P<hours>\d{2})(?P<minutes>\d{2})(?P<seconds>\d{2})$')
+    pattern = re.compile(r'hI ?(?P<year>\d{2})(?P<month>\d{2})(?P<day>\d{2})(?P<hours>\d{2})(?P<minutes>\d{2})(?P<seconds>\d{2})')
+
+    @classmethod
+    def from_match(cls, matches, data):
+        # Every field is a two digit number, all of them go straight to __init__
+        (year, month, day, hours, minutes, seconds) = map(small_int, matches.groups())
+        return cls(year=year, month=month, day=day, hours=hours, minutes=minutes, seconds=seconds)
 
 
 @register
@@ -654,23 +999,30 @@ class SlewToTargetAltAz(SimpleCommand):
 
 
 @register
+@attr.s(slots=True)
 class GuideNorth(SimpleNumericCommand):
-    pattern = re.compile(r'^Mgn ?(\d{4})$')
+    pattern = re.compile(r'Mgn ?(\d{4})')
 
 
 @register
+@attr.s(slots=True)
 class GuideSouth(SimpleNumericCommand):
-    pattern = re.compile(r'^Mgs ?(\d{4})$')
+    pattern = re.compile(r'Mgs ?(\d{4})')
 
 
 @register
+@attr.s(slots=True)
 class GuideEast(SimpleNumericCommand):
-    pattern = re.compile(r'^Mge ?(\d{4})$')
+    pattern = re.compile(r'Mge ?(\d{4})')
 
 
 @register
+@attr.s(slots=True)
 class GuideWest(SimpleNumericCommand):
-    pattern = re.compile(r'^Mgw ?(\d{4})$')
+    pattern = re.compile(r'Mgw ?(\d{4})')
+
+
+GUIDE_PATTERN = register_family('Mg', GuideNorth, GuideSouth, GuideEast, GuideWest)
 
 
 @register
@@ -721,9 +1073,11 @@ class PrecisionPositionToggle(SimpleCommand):
 
 
 @register
+@attr.s(slots=True)
 class SelectSite(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'site.selected'
-    pattern = re.compile(r'^W ?(\d)$')
+    pattern = re.compile(r'W ?(\d)')
 
 
 # XXX TODO: Smart Drive Control
@@ -788,151 +1142,169 @@ class SetSlewRateToMax(SimpleCommand):
 
 
 @register
+@attr.s(slots=True)
 class SetRightAscentionSlewRate(SimpleNumericCommand):
     default_type = float
     store_path = 'mount.slew.rate.right_ascencion'
-    pattern = re.compile(r'^RA ?(?P<value>\d\d\.\d)$')
+    pattern = re.compile(r'RA ?(?P<value>\d\d\.\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetAzimuthSlewRate(SetRightAscentionSlewRate):
     pass
 
 
 @register
+@attr.s(slots=True)
 class SetDeclinationSlewRate(SimpleNumericCommand):
     default_type = float
     store_path = 'mount.slew.rate.declination'
-    pattern = re.compile(r'^Re ?(?P<value>\d\d\.\d)$')
+    pattern = re.compile(r'Re ?(?P<value>\d\d\.\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetAltitudeSlewRate(SetDeclinationSlewRate):
     pass
 
 
 @register
+@attr.s(slots=True)
 class SetGuideRate(SimpleNumericCommand):
     default_type = float
     store_path = 'mount.guide.rate'
-    pattern = re.compile(r'^Rg ?(?P<value>\d\d\.\d)$')
+    pattern = re.compile(r'Rg ?(?P<value>\d\d\.\d)')
 
 
 # Set Commands
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetTargetAltitude(SignedDMSCommand):
     store_path = 'mount.target.altitude'
-    pattern = re.compile(r'^Sa ?(?P<degrees>[-+ ]?\d{2})\*(?P<minutes>\d{2})\'?(?P<seconds>\d{2})?$')
+    pattern = re.compile(r'Sa ?(?P<degrees>[-+ ]?\d{2})\*(?P<minutes>\d{2})\'?(?P<seconds>\d{2})?')
 
 
 @register
+@attr.s(slots=True)
 class SetBrighterLimit(SimpleNumericCommand):
     default_type = float
-    pattern = re.compile(r'^Sb ?(?P<value>[-+ ]?\d\d\.\d)$')
+    pattern = re.compile(r'Sb ?(?P<value>[-+ ]?\d\d\.\d)')
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetBaudRate(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'comms.baud_rate'
-    pattern = re.compile(r'^SB ?(?P<value>\d)$')
+    pattern = re.compile(r'SB ?(?P<value>\d)')
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetHandboxDate(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'site.date'
     value = attr.ib(default=None, repr=False)
     month = attr.ib(default=None)
     day = attr.ib(default=None)
     year = attr.ib(default=None)
-    pattern = re.compile(r'^SC ?(?P<month>\d\d)/(?P<day>\d\d)/(?P<year>\d\d)$')
+    pattern = re.compile(r'SC ?(?P<month>\d\d)/(?P<day>\d\d)/(?P<year>\d\d)')
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetTargetDeclination(SignedDMSCommand):
     store_path = 'mount.target.declination'
-    pattern = re.compile(r'^Sd ?(?P<degrees>[-+ ]?\d{2}):(?P<minutes>\d{2}):?(?P<seconds>\d{2})?$')
+    pattern = re.compile(r'Sd ?' + DMS_PATTERN)
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetTargetSelenographicLatitude(SignedDMSCommand):
     store_path = 'mount.target.selenographic.latitude'
-    pattern = re.compile(r'^SE ?(?P<degrees>[-+ ]?\d{2}):(?P<minutes>\d{2}):?(?P<seconds>\d{2})?$')
+    pattern = re.compile(r'SE ?' + DMS_PATTERN)
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetTargetSelenographicLongitude(SignedDMSCommand):
     store_path = 'mount.target.selenographic.longitude'
-    pattern = re.compile(r'^Se ?(?P<degrees>[-+ ]?\d{2}):(?P<minutes>\d{2}):?(?P<seconds>\d{2})?$')
+    pattern = re.compile(r'Se ?' + DMS_PATTERN)
 
 
 @register
+@attr.s(slots=True)
 class SetFaintMagnitude(SimpleNumericCommand):
     default_type = float
-    pattern = re.compile(r'^Sf ?(?P<value>[-+ ]?\d\d\.\d)$')
+    pattern = re.compile(r'Sf ?(?P<value>[-+ ]?\d\d\.\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetFieldDiameter(SimpleNumericCommand):
-    pattern = re.compile(r'^SF ?(?P<value>\d{3})$')
+    pattern = re.compile(r'SF ?(?P<value>\d{3})')
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetSiteLongitude(SimpleNumericCommand):
     store_path = 'site.longitude'
     value = attr.ib(default=None, repr=False)
     degrees = attr.ib(default=None)
     minutes = attr.ib(default=None)
-    pattern = re.compile(r'^Sg ?(?P<degrees>\d{3})[\*:](?P<minutes>\d\d)$')
+    pattern = re.compile(r'Sg ?(?P<degrees>\d{3})[\*:](?P<minutes>\d\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetUTCOffset(SimpleNumericCommand):
     store_path = 'site.utc_offset'
     default_type = float
-    pattern = re.compile(r'^SG ?(?P<value>[-+ ]?\d\d\.?\d?)$')
+    pattern = re.compile(r'SG ?(?P<value>[-+ ]?\d\d\.?\d?)')
 
 
 @register
+@attr.s(slots=True)
 class SetDSTEnabled(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'site.dst.enabled'
-    pattern = re.compile(r'^SH ?(?P<value>\d)$')
+    pattern = re.compile(r'SH ?(?P<value>\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetMaximumElevation(SimpleNumericCommand):
-    pattern = re.compile(r'^Sh ?(?P<value>\d\d)$')
+    default_type = staticmethod(small_int)
+    pattern = re.compile(r'Sh ?(?P<value>\d\d)')
 
 
 # XXX:
 # These two appear like that in the 2010 manual but seem to be transposed
 # (smallest -> Sl , largest -> Ss)
 @register
+@attr.s(slots=True)
 class SetSmallestObjectSize(SimpleNumericCommand):
-    pattern = re.compile(r'^Sl ?(\d{3})$')
+    pattern = re.compile(r'Sl ?(\d{3})')
 
 
 @register
+@attr.s(slots=True)
 class SetLargestObjectSize(SimpleNumericCommand):
-    pattern = re.compile(r'^Ss ?(\d{3})$')
+    pattern = re.compile(r'Ss ?(\d{3})')
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetLocalTime(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'site.time'
     value = attr.ib(default=None, repr=False)
     hours = attr.ib(default=None)
     minutes = attr.ib(default=None)
     seconds = attr.ib(default=None)
-    pattern = re.compile(r'^SL ?(?P<hours>\d{2}):(?P<minutes>\d{2}):(?P<seconds>\d{2})$')
+    pattern = re.compile(r'SL ?' + HMS_PATTERN)
 
 
 @register
@@ -950,51 +1322,62 @@ class DisableFlexureCorrection(SimpleCommand):
 
 
 @register
+@attr.s(slots=True)
 class SetSite1Name(SimpleNumericCommand):
     store_path = 'site.name_1'
     default_type = str
-    pattern = re.compile(r'^SM ?([\w\s]{1,15})')
+    pattern = re.compile(r'SM ?([\w\s]{1,15})', re.ASCII)
 
 
 @register
+@attr.s(slots=True)
 class SetSite2Name(SimpleNumericCommand):
     store_path = 'site.name_2'
     default_type = str
-    pattern = re.compile(r'^SN ?([\w\s]{1,15})')
+    pattern = re.compile(r'SN ?([\w\s]{1,15})', re.ASCII)
 
 
 @register
+@attr.s(slots=True)
 class SetSite3Name(SimpleNumericCommand):
     store_path = 'site.name_3'
     default_type = str
-    pattern = re.compile(r'^SO ?([\w\s]{1,15})')
+    pattern = re.compile(r'SO ?([\w\s]{1,15})', re.ASCII)
 
 
 @register
+@attr.s(slots=True)
 class SetSite4Name(SimpleNumericCommand):
     store_path = 'site.name_4'
     default_type = str
-    pattern = re.compile(r'^SP ?([\w\s]{1,15})')
+    pattern = re.compile(r'SP ?([\w\s]{1,15})', re.ASCII)
 
 
 @register
+@attr.s(slots=True)
 class SetLowestElevation(SimpleNumericCommand):
-    pattern = re.compile(r'^So ?(\d\d)\*')
+    default_type = staticmethod(small_int)
+    pattern = re.compile(r'So ?(\d\d)\*')
 
 
 @register
+@attr.s(slots=True)
 class SetBacklashValues(SimpleNumericCommand):
-    pattern = re.compile(r'^SpB ?(\d\d)$')
+    default_type = staticmethod(small_int)
+    pattern = re.compile(r'SpB ?(\d\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetHomeData(SimpleNumericCommand):
-    pattern = re.compile(r'^SpH ?(\d\d)')
+    default_type = staticmethod(small_int)
+    pattern = re.compile(r'SpH ?(\d\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetSensorOffsets(SimpleNumericCommand):
-    pattern = re.compile(r'^SpS ?(\d\d\d)')
+    pattern = re.compile(r'SpS ?(\d\d\d)')
 
 
 @register
@@ -1003,8 +1386,9 @@ class StepQualityLimit(SimpleCommand):
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetTargetRightAscencion(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'mount.target.right_ascencion'
     value = attr.ib(default=None, repr=False)
     hours = attr.ib(default=None)
@@ -1013,31 +1397,33 @@ class SetTargetRightAscencion(SimpleNumericCommand):
     type_map = {
         'minutes': float
     }
-    pattern = re.compile(r'^Sr ?(?P<hours>\d{2}):(?P<minutes>\d{2}\.?\d?):?(?P<seconds>\d{2})?$')
+    pattern = re.compile(r'Sr ?(?P<hours>\d{2}):(?P<minutes>\d{2}\.?\d?):?(?P<seconds>\d{2})?')
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetLocalSiderealTime(SimpleNumericCommand):
     value = attr.ib(default=None, repr=False)
+    default_type = staticmethod(small_int)
     hours = attr.ib(default=None)
     minutes = attr.ib(default=None)
     seconds = attr.ib(default=None)
-    pattern = re.compile(r'^SS ?(?P<hours>\d{2}):(?P<minutes>\d{2}):(?P<seconds>\d{2})$')
+    pattern = re.compile(r'SS ?' + HMS_PATTERN)
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetSiteLatitude(SignedDMSCommand):
     store_path = 'site.latitude'
-    pattern = re.compile(r'^St ?(?P<degrees>[-+ ]?\d{2})[\*:](?P<minutes>\d\d):(?P<seconds>\d\d)$')
+    pattern = re.compile(r'St ?(?P<degrees>[-+ ]?\d{2})[\*:](?P<minutes>\d\d):(?P<seconds>\d\d)')
 
 
 @register
+@attr.s(slots=True)
 class SetTrackingRate(SimpleNumericCommand):
     store_path = 'mount.tracking.rate'
     default_type = float
-    pattern = re.compile(r'^ST ?(\d{2,4}\.?\d{0,6})')
+    pattern = re.compile(r'ST ?(\d{2,4}\.?\d{0,6})')
 
 
 @register
@@ -1079,9 +1465,11 @@ class DisableAzimuthPEC(DisableRightAscencionPEC):
 
 
 @register
+@attr.s(slots=True)
 class SetSlewRate(SimpleNumericCommand):
+    default_type = staticmethod(small_int)
     store_path = 'mount.slew.rate'
-    pattern = re.compile(r'^Sw ?(\d)$')
+    pattern = re.compile(r'Sw ?(\d)')
 
 
 # XXX FIXME: there seems to be a parameter missing in the manual
@@ -1091,13 +1479,13 @@ class SetObjectSelectionString(SimpleCommand):
 
 
 @register
-@attr.s
+@attr.s(slots=True)
 class SetTargetAzimuth(SimpleNumericCommand):
     store_path = 'mount.target.azimuth'
     value = attr.ib(default=None, repr=False)
     degrees = attr.ib(default=None)
     minutes = attr.ib(default=None)
-    pattern = re.compile(r'^Sz ?(?P<degrees>\d{3})\*(?P<minutes>\d{2})$')
+    pattern = re.compile(r'Sz ?(?P<degrees>\d{3})\*(?P<minutes>\d{2})')
 
 
 # Tracking
@@ -1105,12 +1493,12 @@ class SetTargetAzimuth(SimpleNumericCommand):
 # These two are also defined in the 'Set' group but do the same thing, so we lump them in a single command.
 @register
 class IncrementManualRate(SimpleCommand):
-    pattern = re.compile(r'(^ST\+$)|(^T\+$)')
+    pattern = ('ST+', 'T+')
 
 
 @register
 class DecrementManualRate(SimpleCommand):
-    pattern = re.compile(r'(^ST\-$)|(^T\-$)')
+    pattern = ('ST-', 'T-')
 
 
 @register
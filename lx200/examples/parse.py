@@ -10,6 +10,5 @@ if __name__ == '__main__':
     parser = Parser()
     for line in fileinput.input():
         parser.feed(line)
-        while(parser.output):
-            command = parser.output.pop()
+        for command in parser.drain():
             print(command)
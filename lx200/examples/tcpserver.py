@@ -28,20 +28,29 @@ class LX200Protocol(asyncio.Protocol):
         decoded_data = data.decode('ascii')
         self.parser.feed(decoded_data)
 
-        logger.debug('<< {}'.format(decoded_data))
-
-        while self.parser.output:
-            command = self.parser.output.pop()
+        # Skip building the debug messages altogether when nobody reads them
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug('<< {}'.format(decoded_data))
+
+        # Replies to every command in this segment go out in a single write
+        out = bytearray()
+        for command in self.parser.drain():
             self.store.commit_command(command)
 
             response = lx200.responses.for_command(command)
 
             self.store.fill_response(response)
 
-            logger.debug('>> {}'.format(repr(response)))
-            logger.debug('>> {}'.format(str(response)))
+            reply = str(response)
+            if debug:
+                logger.debug('>> {}'.format(repr(response)))
+                logger.debug('>> {}'.format(reply))
+
+            out += bytes(reply, 'ascii')
 
-            self.transport.write(bytes(str(response), 'ascii'))
+        if out:
+            self.transport.write(out)
 
 
 async def run():
@@ -1,13 +1,20 @@
+import re
 from collections import deque
 from enum import Enum
 
 
-from .commands import ALL_COMMANDS, is_command, ACK, EOT, UnknownCommand
+from .commands import parse_command, ACK, EOT
 
 
 COMMAND_START = ':'
 COMMAND_END = '#'
 
+# These two are special, they are sent bare instead of framed by : and #
+SPECIAL_COMMANDS = {ACK.pattern: ACK, EOT.pattern: EOT}
+
+# Characters that mean something while idle, anything else is skipped
+IDLE_MARKERS = re.compile('|'.join(re.escape(marker) for marker in (COMMAND_START, *SPECIAL_COMMANDS)))
+
 
 class State(Enum):
     IDLE = 1
@@ -29,13 +36,9 @@ class Parser:
     def feed_one(self, data):
         """ Takes a single character and processes it """
         if self.state is State.IDLE:
-            # These two are special
-            if is_command(data, ACK):
-                self.output.appendleft(ACK.from_data(data))
-                return
-
-            if is_command(data, EOT):
-                self.output.appendleft(EOT.from_data(data))
+            special = SPECIAL_COMMANDS.get(data)
+            if special is not None:
+                self.output.appendleft(special.from_data(data))
                 return
 
             if data == COMMAND_START:
@@ -53,12 +56,43 @@ class Parser:
                     self.__reset_input_state()
 
     def feed(self, data):
-        """ Takes one or more characters and processes them """
-        for c in data:
-            self.feed_one(c)
+        """ Takes one or more characters and processes them, same as calling
+        feed_one() for each of them but scanning whole runs at a time """
+        pos = 0
+        size = len(data)
+        while pos < size:
+            if self.state is State.IDLE:
+                marker = IDLE_MARKERS.search(data, pos)
+                if marker is None:
+                    return
+                pos = marker.end()
+                self.feed_one(marker.group())
+                continue
+
+            end = data.find(COMMAND_END, pos)
+            if end == -1:
+                end = size
+
+            room = self.maxlen - len(self.buffer)
+            if end - pos > room:
+                # The character that does not fit is dropped along with the command
+                self.__reset_input_state()
+                pos += room + 1
+                continue
+
+            self.buffer.extend(data[pos:end])
+            if end == size:
+                return
+
+            self.output.appendleft(self.parse(''.join(self.buffer)))
+            self.__reset_input_state()
+            pos = end + 1
+
+    def drain(self):
+        """ Yields the parsed commands in the order they arrived, removing them from output """
+        output = self.output
+        while output:
+            yield output.pop()
 
     def parse(self, data):
-        for command in ALL_COMMANDS:
-            if is_command(data, command):
-                return command.from_data(data)
-        return UnknownCommand.from_data(data)
+        return parse_command(data)
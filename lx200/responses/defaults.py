@@ -11,10 +11,10 @@ def add_default(command, response_data):
 
 
 def for_command(command):
-    try:
-        return COMMAND_DEFAULT_MAP.get(command, {})
-    except TypeError:
-        return COMMAND_DEFAULT_MAP.get(command.__class__, {})
+    # Command instances are not hashable, look them up by class
+    if not isinstance(command, type):
+        command = command.__class__
+    return COMMAND_DEFAULT_MAP.get(command, {})
 
 
 add_default(c.GetBrowseBrighterMagnitudeLimit, {
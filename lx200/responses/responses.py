@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 from enum import Enum
+import functools
 import attr
 
 from lx200 import commands as c
@@ -12,11 +13,13 @@ COMMAND_RESPONSE_MAP = {}
 
 
 def for_command(command):
-    try:
-        response = COMMAND_RESPONSE_MAP.get(command, None)
-    except TypeError:
-        response = COMMAND_RESPONSE_MAP.get(command.__class__, None)
+    if not isinstance(command, type):
+        command_class = command.__class__
+    else:
+        command_class = command
 
+    # Only the exact class counts, subclasses of a mapped command are not mapped themselves
+    response = vars(command_class).get('response_class')
     if not response:
         raise KeyError('Response not found for command: {}'.format(command))
 
@@ -37,9 +40,11 @@ def map_response(command, *args):
     def __inner(response):
         check_unique(command)
         COMMAND_RESPONSE_MAP[command] = response
+        command.response_class = response
         for cmd in args:
             check_unique(cmd)
             COMMAND_RESPONSE_MAP[cmd] = response
+            cmd.response_class = response
         return response
     return __inner
 
@@ -61,6 +66,27 @@ def get_responses_with_bad_defaults():
     return out
 
 
+# Polled coordinates repeat a lot between slews, the formatted text is cached
+@functools.lru_cache(maxsize=256)
+def format_dms(degrees, degrees_separator, minutes, minutes_separator, seconds, high_precision):
+    out = '{:=+03d}{}{:=02d}'.format(int(degrees), degrees_separator, int(abs(minutes)))
+    if high_precision:
+        out += '{}{:=02.0f}'.format(minutes_separator, abs(seconds))
+
+    return out
+
+
+@functools.lru_cache(maxsize=256)
+def format_hms(hours, hours_separator, minutes, minutes_separator, seconds, high_precision):
+    if high_precision:
+        out = '{:=+03d}{}{:=02d}{}{:=02.0f}'.format(int(hours), hours_separator, int(abs(minutes)), minutes_separator, abs(seconds))
+    else:
+        minutes_frac = abs(minutes + seconds/60.0)
+        out = '{:=+03d}{}{:=04.1f}'.format(int(hours), hours_separator, minutes_frac)
+
+    return out
+
+
 @attr.s
 class BaseResponse:
     value = attr.ib(default='')
@@ -98,11 +124,7 @@ class DMSResponse(BaseResponse):
     seconds = attr.ib(default=0)
 
     def format_value(self, value):
-        out = '{:=+03d}{}{:=02d}'.format(int(self.degrees), self.degrees_separator, int(abs(self.minutes)))
-        if self.high_precision:
-            out += '{}{:=02.0f}'.format(self.minutes_separator, abs(self.seconds))
-
-        return out
+        return format_dms(self.degrees, self.degrees_separator, self.minutes, self.minutes_separator, self.seconds, self.high_precision)
 
 
 @register
@@ -119,13 +141,7 @@ class HMSResponse(BaseResponse):
     seconds = attr.ib(default=0)
 
     def format_value(self, value):
-        if self.high_precision:
-            out = '{:=+03d}{}{:=02d}{}{:=02.0f}'.format(int(self.hours), self.hours_separator, int(abs(self.minutes)), self.minutes_separator, abs(self.seconds))
-        else:
-            minutes_frac = abs(self.minutes + self.seconds/60.0)
-            out = '{:=+03d}{}{:=04.1f}'.format(int(self.hours), self.hours_separator, minutes_frac)
-
-        return out
+        return format_hms(self.hours, self.hours_separator, self.minutes, self.minutes_separator, self.seconds, self.high_precision)
 
 
 @register
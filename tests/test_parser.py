@@ -0,0 +1,45 @@
+import random
+import unittest
+
+from lx200.parser import Parser, COMMAND_START, COMMAND_END, SPECIAL_COMMANDS
+
+
+# Framing characters plus enough command text to build known and unknown commands
+ALPHABET = [COMMAND_START, COMMAND_END, *SPECIAL_COMMANDS] + list('GRDMgn05Sd-x ')
+
+
+class FeedTest(unittest.TestCase):
+
+    def test_feed_matches_feed_one(self):
+        """ feed() must leave the parser exactly as feeding one character at a time does """
+        rng = random.Random(1)
+        for _ in range(5000):
+            maxlen = rng.choice([0, 1, 3, 8, 32])
+            chunks = [
+                ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 15)))
+                for _ in range(rng.randint(1, 5))
+            ]
+
+            runs = Parser(maxlen=maxlen)
+            chars = Parser(maxlen=maxlen)
+            for chunk in chunks:
+                runs.feed(chunk)
+                for char in chunk:
+                    chars.feed_one(char)
+
+                self.assertEqual(list(runs.output), list(chars.output), (chunks, maxlen))
+                self.assertEqual(runs.buffer, chars.buffer, (chunks, maxlen))
+                self.assertIs(runs.state, chars.state, (chunks, maxlen))
+
+    def test_drain_keeps_arrival_order(self):
+        parser = Parser()
+        parser.feed('\x06:GR#junk:GD#')
+        self.assertEqual(
+            [type(command).__name__ for command in parser.drain()],
+            ['ACK', 'GetRightAscencion', 'GetDeclination']
+        )
+        self.assertFalse(parser.output)
+
+
+if __name__ == '__main__':
+    unittest.main()